@@ -0,0 +1,253 @@
+"""
+Benchmark: Tools and Coding Agent Flow
+
+- Input: workspace size options, iterations, --out (JSON path), --baseline (JSON path of an earlier run)
+- Output: JSON with latency percentiles (ms), throughput (ops/s) and failure count per benchmark,
+  plus the peak RSS of the whole run
+- Behavior: Times each file/search utility against a synthetic workspace, then runs coding_agent_flow
+  end to end with a scripted fake call_llm so only framework and I/O overhead is measured.
+  Each flow iteration gets a fresh FilePrefetcher; its per-run hit rate and bytes wasted are recorded.
+  With --baseline, prints per-benchmark ratios and exits 1 if any exceeds --threshold
+  or a benchmark fails more often than in the baseline.
+
+Usage: python -m benchmarks.run --files 500 --out bench_results.json --baseline baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.workspace import create_workspace
+from utils.dir_ops import list_directory
+from utils.insert_file import insert_file
+from utils.read_file import read_file
+from utils.remove_file import remove_range
+from utils.replace_file import replace_range
+from utils.search_ops import grep_search
+
+
+def _peak_rss_kb() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux kilobytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def _summarize(latencies: List[float], failures: int = 0) -> Dict:
+    ms = sorted(l * 1000.0 for l in latencies)
+    total = sum(latencies)
+    return {
+        "iterations": len(ms),
+        "failures": failures,
+        "mean_ms": total * 1000.0 / len(ms) if ms else 0.0,
+        "p50_ms": _percentile(ms, 50),
+        "p90_ms": _percentile(ms, 90),
+        "p99_ms": _percentile(ms, 99),
+        "max_ms": ms[-1] if ms else 0.0,
+        "throughput_ops": len(ms) / total if total > 0 else 0.0,
+    }
+
+
+def _time(fn: Callable[[int], bool], iterations: int, setup: Optional[Callable[[int], None]] = None) -> Dict:
+    """fn returns whether the operation succeeded; failures are counted so a fast failure isn't a speedup."""
+    latencies = []
+    failures = 0
+    for i in range(iterations):
+        if setup is not None:
+            setup(i)
+        start = time.perf_counter()
+        ok = fn(i)
+        latencies.append(time.perf_counter() - start)
+        if not ok:
+            failures += 1
+    return _summarize(latencies, failures)
+
+
+def bench_tools(ws: Dict, iterations: int) -> Dict:
+    root = ws["root"]
+    text_files = ws["text_files"]
+    scratch = os.path.join(root, "_bench_scratch.py")
+    with open(os.path.join(root, text_files[0]), "r", encoding="utf-8") as f:
+        scratch_content = f.read()
+
+    def reset_scratch(_i):
+        with open(scratch, "w", encoding="utf-8") as f:
+            f.write(scratch_content)
+
+    def found(res):
+        # An empty result would be "fast" for the wrong reason; the workspace always has matches
+        ok, matches, _err = res
+        return ok and bool(matches)
+
+    results = {
+        "grep_search": _time(lambda i: found(grep_search(root, r"TODO", False, None, None)), max(1, iterations // 10)),
+        "grep_search_include": _time(lambda i: found(grep_search(root, r"def func_\d+_0\b", True, "*.py", None)), max(1, iterations // 10)),
+        "list_directory": _time(lambda i: list_directory(root, ".")[0], max(1, iterations // 10)),
+        "read_file": _time(lambda i: read_file(root, text_files[i % len(text_files)])[0], iterations),
+        "replace_range": _time(lambda i: replace_range(root, scratch, 3, 5, "    value = 0\n")[0], iterations, reset_scratch),
+        "insert_file": _time(lambda i: insert_file(root, scratch, "# inserted\n", 3)[0], iterations, reset_scratch),
+        "remove_range": _time(lambda i: remove_range(root, scratch, 3, 5)[0], iterations, reset_scratch),
+    }
+    os.remove(scratch)
+    return results
+
+
+def _scripted_llm(ws: Dict) -> Callable[[str], str]:
+    """Replays one list -> grep -> read -> edit -> finish session."""
+    target = ws["text_files"][0]
+    replies = iter([
+        json.dumps({"tool": "list_dir", "reason": "explore", "params": {"relative_workspace_path": "."}}),
+        json.dumps({"tool": "grep_search", "reason": "find todos", "params": {"query": "TODO", "include_pattern": "*.py"}}),
+        json.dumps({"tool": "read_file", "reason": "inspect", "params": {"target_file": target}}),
+        json.dumps({"tool": "edit_file", "reason": "fix", "params": {"target_file": "_bench_flow.py", "instructions": "replace", "code_edit": "x = 1"}}),
+        json.dumps([{"start_line": 1, "end_line": 1, "replacement": "x = 1\n"}]),
+        json.dumps({"tool": "finish", "reason": "done", "params": {}}),
+        "Done.",
+    ])
+    return lambda prompt: next(replies)
+
+
+def bench_flow(ws: Dict, iterations: int) -> Dict:
+    import nodes
+    from flow import create_coding_agent_flow
+    from utils.prefetch import FilePrefetcher
+
+    root = ws["root"]
+    original_call_llm = nodes.call_llm
+    original_prefetcher = nodes.prefetcher
+    flow = create_coding_agent_flow()
+    prefetch_runs: List[Dict] = []
+
+    def collect_prefetch_stats():
+        if nodes.prefetcher is not original_prefetcher:
+            # Let background reads finish so bytes wasted covers the whole run
+            nodes.prefetcher.shutdown()
+            prefetch_runs.append(nodes.prefetcher.stats())
+
+    def setup(_i):
+        with open(os.path.join(root, "_bench_flow.py"), "w", encoding="utf-8") as f:
+            f.write("x = 0\ny = 0\n")
+        nodes.call_llm = _scripted_llm(ws)
+        # A cold cache per iteration, as in a one-shot run
+        collect_prefetch_stats()
+        nodes.prefetcher = FilePrefetcher()
+
+    def run(_i):
+        shared = nodes.get_initial_shared(working_dir=root, user_query="benchmark")
+        flow.run(shared)
+        # The scripted session reads, edits and finishes; anything else means a node failed
+        results = [h.get("result") for h in shared["history"][:-1]]
+        return shared["response"] == "Done." and all(
+            all(r.get("success") for r in res) if isinstance(res, list) else (res or {}).get("success")
+            for res in results
+        )
+
+    try:
+        result = _time(run, iterations, setup)
+        collect_prefetch_stats()
+    finally:
+        nodes.call_llm = original_call_llm
+        nodes.prefetcher = original_prefetcher
+    n = len(prefetch_runs)
+    result["prefetch"] = {
+        "hit_rate_mean": sum(r["hit_rate"] for r in prefetch_runs) / n if n else 0.0,
+        "bytes_prefetched_mean": sum(r["bytes_prefetched"] for r in prefetch_runs) / n if n else 0.0,
+        "bytes_wasted_mean": sum(r["bytes_wasted"] for r in prefetch_runs) / n if n else 0.0,
+        "runs": prefetch_runs,
+    }
+    return {"coding_agent_flow": result}
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return benchmarks whose p50 grew by more than `threshold` (e.g. 1.2 = +20%) or that fail more
+    often than in the baseline, plus "peak_rss_kb" if the run's peak RSS grew past `threshold`."""
+    regressions = []
+    print(f"{'benchmark':<24}{'p50 ms':>12}{'base':>12}{'ratio':>8}")
+    for name, cur in results["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if not base:
+            continue
+        ratio = cur["p50_ms"] / base["p50_ms"] if base["p50_ms"] > 0 else 1.0
+        failing = cur.get("failures", 0) > base.get("failures", 0)
+        flag = ""
+        if ratio > threshold:
+            flag += "  REGRESSION"
+        if failing:
+            flag += f"  FAILURES {cur['failures']}/{cur['iterations']}"
+        print(f"{name:<24}{cur['p50_ms']:>12.3f}{base['p50_ms']:>12.3f}{ratio:>8.2f}{flag}")
+        if flag:
+            regressions.append(name)
+    cur_rss = results.get("peak_rss_kb", 0)
+    base_rss = baseline.get("peak_rss_kb", 0)
+    if base_rss and cur_rss / base_rss > threshold:
+        print(f"peak_rss_kb {cur_rss} vs baseline {base_rss}  REGRESSION")
+        regressions.append("peak_rss_kb")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark tools and the coding agent flow")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--file-size", type=int, default=4096)
+    parser.add_argument("--binary-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--flow-iterations", type=int, default=20)
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    tmp = tempfile.mkdtemp(prefix="bench_ws_")
+    try:
+        ws = create_workspace(tmp, args.files, args.depth, args.file_size, args.binary_ratio, args.seed)
+        benchmarks = bench_tools(ws, args.iterations)
+        benchmarks.update(bench_flow(ws, args.flow_iterations))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "workspace": {k: v for k, v in ws.items() if k not in ("root", "text_files", "binary_files")},
+        # Process high-water mark for the whole run, workspace generation included
+        "peak_rss_kb": _peak_rss_kb(),
+        "benchmarks": benchmarks,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"wrote {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    else:
+        for name, b in benchmarks.items():
+            print(f"{name:<24} p50={b['p50_ms']:.3f}ms p99={b['p99_ms']:.3f}ms {b['throughput_ops']:.1f} ops/s failures={b['failures']}")
+        print(f"peak_rss_kb={results['peak_rss_kb']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
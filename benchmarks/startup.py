@@ -0,0 +1,135 @@
+"""
+Benchmark: Cold Start
+
+- Input: --runs (int), --out (JSON path), --baseline (JSON path of an earlier run)
+- Output: JSON with p50/p90 latency (ms) for each startup phase, plus peak child RSS
+- Behavior: Spawns fresh interpreters to measure
+  * first_llm_request: process spawn until the local stub server receives the first request.
+    This is the headline number: everything a one-shot CI invocation pays before the model starts working.
+  * import_flow: cumulative `import flow` time reported by `python -X importtime`
+  * process_total: process spawn until a one-shot coding_agent_flow run exits
+
+Usage: python -m benchmarks.startup --runs 10 --out startup_results.json --baseline old.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.run import _summarize, compare
+from utils.llm_stub_server import start_stub_server
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_ONE_SHOT = """
+import sys
+from flow import get_flow
+from nodes import get_initial_shared
+
+get_flow("coding_agent").run(get_initial_shared(working_dir=".", user_query="startup benchmark"))
+print("openai" in sys.modules)
+"""
+
+
+def _import_time_us(module: str) -> int:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    # Lines look like: "import time:       404 |      81226 | flow"
+    for line in proc.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    return 0
+
+
+def _imported_modules(module: str) -> List[str]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    return [line.split("|")[-1].strip() for line in proc.stderr.splitlines() if line.startswith("import time:")][1:]
+
+
+def _one_shot(server, base_url: str) -> Dict:
+    env = dict(os.environ, OPENAI_BASE_URL=base_url, OPENAI_API_KEY="stub")
+    with server.stats_lock:
+        server.stats["first_request_at"] = None
+    spawned = time.time()
+    proc = subprocess.run([sys.executable, "-c", _ONE_SHOT], cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    finished = time.time()
+    if proc.returncode != 0:
+        raise RuntimeError(f"one-shot run failed:\n{proc.stderr}")
+    return {
+        "first_llm_request": server.stats["first_request_at"] - spawned,
+        "process_total": finished - spawned,
+    }, proc.stdout.strip().splitlines()[-1] == "True"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark cold start of the coding agent")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--out", default="startup_results.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    phases: Dict[str, List[float]] = {"first_llm_request": [], "import_flow": [], "process_total": []}
+    openai_loaded = False
+    server, base_url = start_stub_server(reply="not json, so the agent finishes")
+    try:
+        for _ in range(args.runs):
+            phases["import_flow"].append(_import_time_us("flow") / 1e6)
+            timings, loaded = _one_shot(server, base_url)
+            openai_loaded = openai_loaded or loaded
+            for name, seconds in timings.items():
+                phases[name].append(seconds)
+    finally:
+        server.shutdown()
+
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    child_rss = child_rss // 1024 if sys.platform == "darwin" else child_rss
+    benchmarks = {}
+    for name, latencies in phases.items():
+        summary = _summarize(latencies)
+        summary.pop("throughput_ops")
+        benchmarks[name] = summary
+
+    modules = _imported_modules("flow")
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "import_flow_modules": len(modules),
+        "openai_loaded_by_one_shot_run": openai_loaded,
+        # Largest peak RSS of any spawned interpreter
+        "peak_rss_kb": child_rss,
+        "benchmarks": benchmarks,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"wrote {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    else:
+        for name, b in benchmarks.items():
+            print(f"{name:<24} p50={b['p50_ms']:.1f}ms p90={b['p90_ms']:.1f}ms")
+        print(f"modules imported by flow={len(modules)} openai loaded by one-shot run={openai_loaded}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Benchmark: Synthetic Workspace
+
+- Input: root (str), files (int), depth (int), file_size (int, bytes), binary_ratio (float), seed (int)
+- Output: dict describing the generated workspace (text_files, binary_files, bytes)
+- Behavior: Creates a deterministic tree of python-like text files and binary blobs under root.
+  Roughly one line in twenty contains "TODO" so grep benchmarks have matches to report.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+from typing import Dict, List
+
+
+_DIR_NAMES = ["core", "api", "models", "services", "handlers", "tests", "lib", "common"]
+
+
+def _text_content(rng: random.Random, size: int, idx: int) -> str:
+    lines: List[str] = [f'"""Synthetic module {idx}."""\n', "\n"]
+    total = sum(len(l) for l in lines)
+    n = 0
+    while total < size:
+        if n % 6 == 0:
+            line = f"def func_{idx}_{n}(value):\n"
+        elif rng.random() < 0.05:
+            line = f"    # TODO: revisit handling of case {n}\n"
+        else:
+            line = f"    value = value * {rng.randint(1, 97)} + {rng.randint(0, 999)}  # step {n}\n"
+        lines.append(line)
+        total += len(line)
+        n += 1
+    return "".join(lines)
+
+
+def create_workspace(
+    root: str,
+    files: int = 200,
+    depth: int = 3,
+    file_size: int = 4096,
+    binary_ratio: float = 0.1,
+    seed: int = 0,
+) -> Dict:
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+
+    # A fixed pool of directories at every level up to `depth`
+    dirs = [""]
+    frontier = [""]
+    for _ in range(depth):
+        nxt = []
+        for parent in frontier:
+            for name in rng.sample(_DIR_NAMES, 2):
+                nxt.append(os.path.join(parent, name))
+        dirs.extend(nxt)
+        frontier = nxt
+    for d in dirs:
+        os.makedirs(os.path.join(root, d), exist_ok=True)
+
+    text_files: List[str] = []
+    binary_files: List[str] = []
+    total_bytes = 0
+    for i in range(files):
+        d = rng.choice(dirs)
+        if rng.random() < binary_ratio:
+            # Alternate extensionless blobs (scanned by grep) and .bin files (skipped)
+            rel = os.path.join(d, f"blob_{i}.bin" if i % 2 else f"blob_{i}")
+            with open(os.path.join(root, rel), "wb") as f:
+                f.write(rng.randbytes(file_size))
+            binary_files.append(rel)
+            total_bytes += file_size
+        else:
+            rel = os.path.join(d, f"module_{i}.py")
+            content = _text_content(rng, file_size, i)
+            with open(os.path.join(root, rel), "w", encoding="utf-8") as f:
+                f.write(content)
+            text_files.append(rel)
+            total_bytes += len(content)
+
+    return {
+        "root": root,
+        "files": files,
+        "depth": depth,
+        "file_size": file_size,
+        "binary_ratio": binary_ratio,
+        "seed": seed,
+        "text_files": text_files,
+        "binary_files": binary_files,
+        "bytes": total_bytes,
+    }
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ws = create_workspace(tmp, files=50, depth=2)
+        print("text=", len(ws["text_files"]), "binary=", len(ws["binary_files"]), "bytes=", ws["bytes"])
@@ -25,8 +25,6 @@ def create_qa_flow():
     # Create flow starting with input node
     return Flow(start=get_question_node)
 
-qa_flow = create_qa_flow()
-
 
 def create_coding_agent_flow():
     decide = MainDecisionAgentNode()
@@ -61,4 +59,23 @@ def create_coding_agent_flow():
     return Flow(start=decide)
 
 
-coding_agent_flow = create_coding_agent_flow()
\ No newline at end of file
+# Flows are built on first use so a run only pays for the flow it needs
+FLOW_FACTORIES = {
+    "qa": create_qa_flow,
+    "coding_agent": create_coding_agent_flow,
+}
+_flows = {}
+
+
+def get_flow(name):
+    """Return the flow registered under name, building it on first access."""
+    if name not in _flows:
+        _flows[name] = FLOW_FACTORIES[name]()
+    return _flows[name]
+
+
+def __getattr__(name):
+    # Keep `from flow import qa_flow, coding_agent_flow` working without eager construction
+    if name.endswith("_flow") and name[: -len("_flow")] in FLOW_FACTORIES:
+        return get_flow(name[: -len("_flow")])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
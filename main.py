@@ -1,6 +1,6 @@
 import logging
 import os
-from flow import create_qa_flow, coding_agent_flow
+from flow import get_flow
 from nodes import get_initial_shared
 
 # Example main function
@@ -13,7 +13,7 @@ def main():
     user_query = input("Describe your coding request: ")
     shared = get_initial_shared(working_dir=working_dir, user_query=user_query)
 
-    flow = coding_agent_flow
+    flow = get_flow("coding_agent")
     flow.run(shared)
 
     print("\n=== Final Response ===")
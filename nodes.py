@@ -1,11 +1,11 @@
 import logging
 from pocketflow import Node, BatchNode
 from utils.call_llm import call_llm
-from utils.read_file import read_file as util_read_file
 from utils.search_ops import grep_search as util_grep_search
 from utils.dir_ops import list_directory as util_list_directory
 from utils.delete_file import delete_file as util_delete_file
 from utils.replace_file import replace_range as util_replace_range
+from utils.prefetch import prefetcher, rank_grep_results, rank_listing
 
 class GetQuestionNode(Node):
     def exec(self, _):
@@ -94,7 +94,7 @@ class ReadFileActionNode(Node):
 
     def exec(self, inputs):
         working_dir, target = inputs
-        ok, content, err = util_read_file(working_dir, target)
+        ok, content, err = prefetcher.read_file(working_dir, target)
         return {"success": ok, "content": content, "error": err}
 
     def post(self, shared, prep_res, exec_res):
@@ -129,6 +129,8 @@ class GrepSearchActionNode(Node):
     def post(self, shared, prep_res, exec_res):
         shared["history"][-1]["result"] = exec_res
         logging.info("GrepSearchActionNode success=%s matches=%s", exec_res.get("success"), len(exec_res.get("results") or []))
+        # Warm the cache for the likely next read_file while the next decision is made
+        prefetcher.prefetch(prep_res[0], rank_grep_results(exec_res.get("results") or []))
         return "decide_next"
 
 
@@ -146,6 +148,8 @@ class ListDirectoryActionNode(Node):
     def post(self, shared, prep_res, exec_res):
         shared["history"][-1]["result"] = exec_res
         logging.info("ListDirectoryActionNode success=%s", exec_res.get("success"))
+        if exec_res.get("success"):
+            prefetcher.prefetch(prep_res[0], rank_listing(*prep_res))
         return "decide_next"
 
 
@@ -162,6 +166,7 @@ class DeleteFileActionNode(Node):
 
     def post(self, shared, prep_res, exec_res):
         shared["history"][-1]["result"] = exec_res
+        prefetcher.invalidate(*prep_res)
         logging.info("DeleteFileActionNode success=%s", exec_res.get("success"))
         return "decide_next"
 
@@ -174,7 +179,7 @@ class ReadTargetFileNode(Node):
 
     def exec(self, inputs):
         working_dir, target = inputs
-        ok, content, err = util_read_file(working_dir, target)
+        ok, content, err = prefetcher.read_file(working_dir, target)
         return {"success": ok, "content": content, "error": err}
 
     def post(self, shared, prep_res, exec_res):
@@ -246,6 +251,7 @@ class ApplyChangesBatchNode(BatchNode):
     def post(self, shared, prep_res, exec_res_list):
         shared["history"][-1]["result"] = exec_res_list
         shared["edit_operations"] = []
+        prefetcher.invalidate(self._working_dir, self._target)
         logging.info("ApplyChangesBatchNode applied count=%s", len(exec_res_list))
         return "decide_next"
 
@@ -264,4 +270,5 @@ class FormatResponseNode(Node):
     def post(self, shared, prep_res, exec_res):
         shared["response"] = exec_res
         logging.info("FormatResponseNode produced response length=%s", len(exec_res) if exec_res else 0)
+        prefetcher.log_stats()
         return "done"
\ No newline at end of file
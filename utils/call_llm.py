@@ -1,15 +1,178 @@
-from openai import OpenAI
+import json
 import os
+import random
+import threading
+import time
+
+from utils.rate_limit import AdaptiveConcurrency, LLMMetrics, TokenBucket
+
+# Limits can be tuned per deployment through the environment
+LLM_MODEL = os.environ.get("LLM_MODEL", "gpt-4o")
+LLM_RPM = float(os.environ.get("LLM_RPM", "500"))
+LLM_TPM = float(os.environ.get("LLM_TPM", "30000"))
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", "16"))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "5"))
+LLM_TIMEOUT = float(os.environ.get("LLM_TIMEOUT", "120"))
+LLM_EXPECTED_OUTPUT_TOKENS = int(os.environ.get("LLM_EXPECTED_OUTPUT_TOKENS", "512"))
+
+_BACKOFF_BASE = 0.5
+_BACKOFF_CAP = 20.0
+
+# One keep-alive connection per thread
+_local = threading.local()
+
+request_bucket = TokenBucket(rate_per_sec=LLM_RPM / 60.0, capacity=max(1.0, LLM_RPM / 60.0))
+token_bucket = TokenBucket(rate_per_sec=LLM_TPM / 60.0, capacity=LLM_TPM)
+concurrency = AdaptiveConcurrency(initial=min(4, LLM_MAX_CONCURRENCY), max_limit=LLM_MAX_CONCURRENCY)
+metrics = LLMMetrics()
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    pass
+
+
+class LLMHTTPError(Exception):
+    """Non-2xx response from the chat completions endpoint."""
+
+    def __init__(self, status, message, retry_after=None):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _chat_completion(prompt, timeout):
+    """POST one OpenAI-compatible chat completion using only the stdlib.
+
+    The openai SDK (pydantic, httpx) takes ~0.6s to import, which dominated
+    time-to-first-request for one-shot runs. Retries live in call_llm.
+    """
+    # http.client pulls in email/ssl; import on first call so `import flow` stays cheap
+    import http.client
+    from urllib.parse import urlsplit
+
+    base_url = os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1")
+    url = urlsplit(base_url.rstrip("/") + "/chat/completions")
+    body = json.dumps({"model": LLM_MODEL, "messages": [{"role": "user", "content": prompt}]}).encode("utf-8")
+    headers = {
+        "Authorization": f"Bearer {os.environ.get('OPENAI_API_KEY', 'your-api-key')}",
+        "Content-Type": "application/json",
+    }
+
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.netloc != url.netloc:
+        cls = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+        conn = cls(url.netloc)
+        _local.conn, _local.netloc = conn, url.netloc
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    try:
+        conn.request("POST", url.path, body, headers)
+        resp = conn.getresponse()
+        data = resp.read()
+    except Exception:
+        # Drop a half-used connection; the next request reconnects
+        conn.close()
+        raise
+
+    if resp.status >= 300:
+        try:
+            message = json.loads(data)["error"]["message"]
+        except (ValueError, KeyError, TypeError):
+            message = data[:200].decode("utf-8", errors="replace")
+        try:
+            retry_after = float(resp.getheader("retry-after"))
+        except (TypeError, ValueError):
+            retry_after = None
+        raise LLMHTTPError(resp.status, message, retry_after)
+    return json.loads(data)["choices"][0]["message"]["content"]
+
+
+def _estimate_tokens(prompt):
+    # ~4 characters per token is close enough for budgeting
+    return len(prompt) // 4 + LLM_EXPECTED_OUTPUT_TOKENS
+
+
+def _classify_error(e):
+    """Return (retryable, throttled, retry_after) for an exception raised by _chat_completion."""
+    if isinstance(e, LLMHTTPError):
+        if e.status == 429 or e.status >= 500:
+            return True, True, e.retry_after
+        return e.status in (408, 409), False, e.retry_after
+    # OSError covers refused/reset connections and socket timeouts; an overloaded endpoint often
+    # shows up as timeouts. HTTPException (e.g. a bad status line) is only ever raised by http.client.
+    if isinstance(e, OSError) or type(e).__module__ == "http.client":
+        return True, True, None
+    return False, False, None
+
+
+def _backoff(attempt, retry_after):
+    # Full jitter keeps parallel runs from retrying in lockstep
+    delay = random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
 
 # Learn more about calling the LLM: https://the-pocket.github.io/PocketFlow/utility_function/llm.html
-def call_llm(prompt):    
-    client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY", "your-api-key"))
-    r = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[{"role": "user", "content": prompt}]
-    )
-    return r.choices[0].message.content
-    
+def call_llm(prompt, timeout=None):
+    """Call the LLM with rate limiting, adaptive concurrency and jittered retries.
+
+    `timeout` is the deadline in seconds for the whole call, retries included.
+    """
+    deadline = time.monotonic() + (LLM_TIMEOUT if timeout is None else timeout)
+    tokens = _estimate_tokens(prompt)
+    metrics.record_call()
+
+    attempt = 0
+    while True:
+        queued = time.monotonic()
+        ticket = 0
+        if request_bucket.acquire(1, deadline) and token_bucket.acquire(tokens, deadline):
+            ticket = concurrency.acquire(deadline)
+        if not ticket:
+            metrics.record_done(success=False, deadline_exceeded=True)
+            raise LLMDeadlineExceeded("LLM call deadline exceeded while waiting for rate limit")
+        metrics.record_attempt(time.monotonic() - queued)
+
+        # (throttled, adjust) for the release below; stays neutral if anything unexpected raises
+        outcome = (False, False)
+        error = None
+        try:
+            content = _chat_completion(prompt, max(0.1, deadline - time.monotonic()))
+            outcome = (False, True)
+        except Exception as e:
+            error = e
+            retryable, throttled, retry_after = _classify_error(e)
+            # Only throttling says anything about endpoint capacity; client errors leave the limit alone
+            outcome = (throttled, throttled)
+        finally:
+            concurrency.release(ticket, throttled=outcome[0], adjust=outcome[1])
+
+        if error is None:
+            metrics.record_done(success=True)
+            return content
+
+        delay = _backoff(attempt, retry_after)
+        if not retryable or attempt >= LLM_MAX_RETRIES:
+            metrics.record_done(success=False)
+            raise error
+        if time.monotonic() + delay >= deadline:
+            metrics.record_done(success=False, deadline_exceeded=True)
+            raise LLMDeadlineExceeded(f"LLM call deadline exceeded after {attempt + 1} attempts") from error
+        metrics.record_retry(throttled)
+        attempt += 1
+        time.sleep(delay)
+
+
+def get_llm_metrics():
+    snapshot = metrics.snapshot()
+    snapshot["concurrency_limit"] = concurrency.limit
+    snapshot["in_flight"] = concurrency.in_flight
+    return snapshot
+
+
 if __name__ == "__main__":
     prompt = "What is the meaning of life?"
     print(call_llm(prompt))
+    print(get_llm_metrics())
@@ -0,0 +1,115 @@
+"""
+Utility: Local LLM Stub Server
+
+- Input: throttle_rate (float), error_rate (float), latency (float), retry_after (float | None), reply (str), seed (int | None)
+- Output: (server, base_url) from start_stub_server; point OPENAI_BASE_URL at base_url
+- Behavior: Serves an OpenAI-compatible POST /v1/chat/completions. Each request is answered with
+  429 (probability throttle_rate), 500 (probability error_rate) or a completion after `latency` seconds.
+  With a seed the sequence of injected failures is reproducible.
+  Used to exercise call_llm's rate limiting and retries without a real endpoint.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict, headers: Optional[dict] = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        with server.stats_lock:
+            server.stats["requests"] += 1
+            if server.stats["first_request_at"] is None:
+                server.stats["first_request_at"] = time.time()
+            roll = server.rng.random()
+
+        if roll < server.throttle_rate:
+            with server.stats_lock:
+                server.stats["throttled"] += 1
+            headers = {"Retry-After": str(server.retry_after)} if server.retry_after is not None else None
+            self._send_json(429, {"error": {"message": "Rate limit exceeded", "type": "rate_limit"}}, headers)
+            return
+        if roll < server.throttle_rate + server.error_rate:
+            with server.stats_lock:
+                server.stats["errors"] += 1
+            self._send_json(500, {"error": {"message": "Injected server error", "type": "server_error"}})
+            return
+
+        time.sleep(server.latency)
+        with server.stats_lock:
+            server.stats["completed"] += 1
+        self._send_json(200, {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": server.reply},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        })
+
+
+def start_stub_server(
+    throttle_rate: float = 0.0,
+    error_rate: float = 0.0,
+    latency: float = 0.0,
+    retry_after: Optional[float] = None,
+    reply: str = "stub reply",
+    port: int = 0,
+    seed: Optional[int] = None,
+) -> Tuple[ThreadingHTTPServer, str]:
+    server = ThreadingHTTPServer(("127.0.0.1", port), _StubHandler)
+    server.daemon_threads = True
+    server.throttle_rate = throttle_rate
+    server.error_rate = error_rate
+    server.latency = latency
+    server.retry_after = retry_after
+    server.reply = reply
+    server.rng = random.Random(seed)
+    server.stats = {"requests": 0, "throttled": 0, "errors": 0, "completed": 0, "first_request_at": None}
+    server.stats_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, bound_port = server.server_address[:2]
+    return server, f"http://{host}:{bound_port}/v1"
+
+
+if __name__ == "__main__":
+    import os
+    from concurrent.futures import ThreadPoolExecutor
+
+    server, base_url = start_stub_server(throttle_rate=0.2, error_rate=0.1, latency=0.05, seed=0)
+    os.environ["OPENAI_BASE_URL"] = base_url
+    # At 30% injected failures, 20 retries make exhausting them (0.3**21 per call) practically impossible
+    os.environ.setdefault("LLM_MAX_RETRIES", "20")
+
+    from utils.call_llm import call_llm, get_llm_metrics
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        replies = list(pool.map(lambda i: call_llm(f"request {i}", timeout=300), range(40)))
+    print("replies=", len(replies))
+    print("server stats=", server.stats)
+    print("client metrics=", get_llm_metrics())
+    server.shutdown()
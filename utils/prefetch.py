@@ -0,0 +1,215 @@
+"""
+Utility: Speculative File Prefetch
+
+- Input: working_dir (str), candidate files ranked from the last grep_search / list_dir result
+- Output: read_file(working_dir, target_file) -> (success: bool, content: str, error: str | None), same as utils.read_file
+- Behavior: A thread pool reads the top-ranked files into a bounded LRU cache while the decision
+  LLM call is in flight. Entries are validated against mtime/size on every hit.
+  stats() reports hit rate and bytes that were prefetched but never read.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from utils.read_file import read_file as util_read_file
+from utils.search_ops import _is_text_file
+
+
+def _resolve_path(working_dir: str, target_file: str) -> str:
+    if os.path.isabs(target_file):
+        return target_file
+    return os.path.abspath(os.path.join(working_dir, target_file))
+
+
+def rank_grep_results(results: List[Dict]) -> List[str]:
+    """Files with the most matches first; ties keep first-seen order."""
+    counts = Counter(r.get("file") for r in results if r.get("file"))
+    return [f for f, _ in counts.most_common()]
+
+
+def rank_listing(working_dir: str, relative_workspace_path: str) -> List[str]:
+    """Text files directly inside the listed directory, most recently modified first."""
+    abs_dir = _resolve_path(working_dir, relative_workspace_path)
+    try:
+        entries = [os.path.join(abs_dir, name) for name in os.listdir(abs_dir)]
+    except OSError:
+        return []
+    files = []
+    for path in entries:
+        try:
+            if os.path.isfile(path) and _is_text_file(path):
+                files.append((os.path.getmtime(path), path))
+        except OSError:
+            continue
+    files.sort(reverse=True)
+    return [os.path.relpath(p, working_dir) for _, p in files]
+
+
+class _Entry:
+    __slots__ = ("content", "mtime_ns", "size", "nbytes", "used")
+
+    def __init__(self, content: str, mtime_ns: int, size: int):
+        self.content = content
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.nbytes = size
+        self.used = False
+
+
+class FilePrefetcher:
+    def __init__(
+        self,
+        top_k: int = 5,
+        max_workers: int = 4,
+        max_entries: int = 64,
+        max_bytes: int = 16 * 1024 * 1024,
+        max_file_bytes: int = 1024 * 1024,
+    ):
+        self.top_k = top_k
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self._max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._cache: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = Counter()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="prefetch")
+        return self._pool
+
+    def _drop(self, key: str) -> None:
+        # Caller holds the lock
+        entry = self._cache.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.nbytes
+        if not entry.used:
+            self._stats["bytes_wasted"] += entry.nbytes
+
+    def _load(self, key: str) -> None:
+        try:
+            st = os.stat(key)
+            if st.st_size > self.max_file_bytes:
+                return
+            with open(key, "r", encoding="utf-8") as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError):
+            return
+        entry = _Entry(content, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            self._drop(key)
+            self._cache[key] = entry
+            self._bytes += entry.nbytes
+            self._stats["files_prefetched"] += 1
+            self._stats["bytes_prefetched"] += entry.nbytes
+            while self._cache and (len(self._cache) > self.max_entries or self._bytes > self.max_bytes):
+                self._stats["evictions"] += 1
+                self._drop(next(iter(self._cache)))
+
+    def _finish(self, key: str) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def prefetch(self, working_dir: str, ranked_files: List[str]) -> int:
+        """Schedule background reads for the top_k files. Returns the number scheduled."""
+        scheduled = 0
+        for target in ranked_files[: self.top_k]:
+            key = _resolve_path(working_dir, target)
+            with self._lock:
+                if key in self._cache or key in self._pending:
+                    continue
+                future = self._executor().submit(self._load, key)
+                self._pending[key] = future
+            future.add_done_callback(lambda _f, k=key: self._finish(k))
+            scheduled += 1
+        return scheduled
+
+    def lookup(self, working_dir: str, target_file: str) -> Optional[_Entry]:
+        key = _resolve_path(working_dir, target_file)
+        with self._lock:
+            future = self._pending.get(key)
+        if future is not None:
+            # Prefetch already in flight; waiting for it is cheaper than a second read
+            future.result()
+        try:
+            st = os.stat(key)
+        except OSError:
+            st = None
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and (st is None or st.st_mtime_ns != entry.mtime_ns or st.st_size != entry.size):
+                self._stats["stale"] += 1
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._cache.move_to_end(key)
+            self._stats["hits"] += 1
+            entry.used = True
+            return entry
+
+    def read_file(self, working_dir: str, target_file: str) -> Tuple[bool, str, Optional[str]]:
+        entry = self.lookup(working_dir, target_file)
+        if entry is not None:
+            return True, entry.content, None
+        return util_read_file(working_dir, target_file)
+
+    def invalidate(self, working_dir: str, target_file: str) -> None:
+        key = _resolve_path(working_dir, target_file)
+        with self._lock:
+            self._drop(key)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            s = dict(self._stats)
+            unused = sum(e.nbytes for e in self._cache.values() if not e.used)
+        lookups = s.get("hits", 0) + s.get("misses", 0)
+        return {
+            "hits": s.get("hits", 0),
+            "misses": s.get("misses", 0),
+            "hit_rate": s.get("hits", 0) / lookups if lookups else 0.0,
+            "files_prefetched": s.get("files_prefetched", 0),
+            "bytes_prefetched": s.get("bytes_prefetched", 0),
+            # Evicted/stale entries never read, plus cached entries not read yet
+            "bytes_wasted": s.get("bytes_wasted", 0) + unused,
+            "evictions": s.get("evictions", 0),
+            "stale": s.get("stale", 0),
+        }
+
+    def shutdown(self) -> None:
+        """Wait for in-flight prefetches and stop the worker threads."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def log_stats(self) -> None:
+        logging.info("FilePrefetcher stats=%s", self.stats())
+
+
+prefetcher = FilePrefetcher()
+
+
+if __name__ == "__main__":
+    from utils.search_ops import grep_search
+
+    wd = os.getcwd()
+    ok, results, err = grep_search(wd, r"def ", False, "*.py", None)
+    ranked = rank_grep_results(results)
+    print("ranked=", ranked[:5])
+    print("scheduled=", prefetcher.prefetch(wd, ranked))
+    for target in ranked[:2]:
+        ok, content, err = prefetcher.read_file(wd, target)
+        print(target, "success=", ok, "bytes=", len(content))
+    print(prefetcher.stats())
@@ -0,0 +1,183 @@
+"""
+Utility: Rate Limiting and Adaptive Concurrency
+
+- TokenBucket: refills `rate_per_sec` units per second up to `capacity`; a rate <= 0 means unlimited.
+  acquire(amount, deadline) blocks until the units are available; returns False if the deadline would pass first.
+- AdaptiveConcurrency: AIMD limit on in-flight calls. acquire() returns a ticket that is passed back to release().
+  Each success grows the limit additively; a throttle (429/5xx/timeout) shrinks it multiplicatively, at most
+  once per window: calls acquired before the last decrease do not trigger another one.
+- LLMMetrics: thread-safe counters (queue wait, retries, throttles, effective RPS).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Optional
+
+
+class TokenBucket:
+    def __init__(self, rate_per_sec: float, capacity: float):
+        self.rate_per_sec = float(rate_per_sec)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate_per_sec)
+        self._last = now
+
+    def acquire(self, amount: float = 1.0, deadline: Optional[float] = None) -> bool:
+        if self.rate_per_sec <= 0:
+            return True
+        # Requests larger than the bucket could never be served; cap them at a full bucket
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return True
+                wait = (amount - self._tokens) / self.rate_per_sec
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class AdaptiveConcurrency:
+    def __init__(
+        self,
+        initial: float = 4,
+        min_limit: float = 1,
+        max_limit: float = 32,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+    ):
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.increase = float(increase)
+        self.decrease = float(decrease)
+        self._limit = max(self.min_limit, min(self.max_limit, float(initial)))
+        self._in_flight = 0
+        self._issued = 0
+        # Tickets up to this one were in flight when the limit was last decreased
+        self._decrease_epoch = 0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> float:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self, deadline: Optional[float] = None) -> int:
+        """Wait for a slot. Returns a ticket (>= 1), or 0 if the deadline passed first."""
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                timeout = None if deadline is None else deadline - time.monotonic()
+                if timeout is not None and timeout <= 0:
+                    return 0
+                self._cond.wait(timeout)
+            self._in_flight += 1
+            self._issued += 1
+            return self._issued
+
+    def release(self, ticket: int, throttled: bool = False, adjust: bool = True) -> None:
+        """Free a slot. adjust=False leaves the limit alone (e.g. for client errors)."""
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            if adjust and throttled:
+                if ticket > self._decrease_epoch:
+                    self._limit = max(self.min_limit, self._limit * self.decrease)
+                    self._decrease_epoch = self._issued
+            elif adjust:
+                # Additive increase of roughly `increase` per window of `limit` successes
+                self._limit = min(self.max_limit, self._limit + self.increase / self._limit)
+            self._cond.notify_all()
+
+
+class LLMMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.successes = 0
+            self.failures = 0
+            self.attempts = 0
+            self.retries = 0
+            self.throttled = 0
+            self.deadline_exceeded = 0
+            self.queue_wait_total = 0.0
+            self.queue_wait_max = 0.0
+            self._first_call: Optional[float] = None
+            self._last_done: Optional[float] = None
+
+    def record_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+            if self._first_call is None:
+                self._first_call = time.monotonic()
+
+    def record_attempt(self, queue_wait: float) -> None:
+        with self._lock:
+            self.attempts += 1
+            self.queue_wait_total += queue_wait
+            self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+
+    def record_retry(self, throttled: bool) -> None:
+        with self._lock:
+            self.retries += 1
+            if throttled:
+                self.throttled += 1
+
+    def record_done(self, success: bool, deadline_exceeded: bool = False) -> None:
+        with self._lock:
+            if success:
+                self.successes += 1
+            else:
+                self.failures += 1
+            if deadline_exceeded:
+                self.deadline_exceeded += 1
+            self._last_done = time.monotonic()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            elapsed = 0.0
+            if self._first_call is not None and self._last_done is not None:
+                elapsed = self._last_done - self._first_call
+            return {
+                "calls": self.calls,
+                "successes": self.successes,
+                "failures": self.failures,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "deadline_exceeded": self.deadline_exceeded,
+                "queue_wait_avg": self.queue_wait_total / self.attempts if self.attempts else 0.0,
+                "queue_wait_max": self.queue_wait_max,
+                "effective_rps": self.successes / elapsed if elapsed > 0 else 0.0,
+            }
+
+
+if __name__ == "__main__":
+    bucket = TokenBucket(rate_per_sec=5, capacity=2)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    print("6 acquires at 5/s (burst 2) took", round(time.monotonic() - start, 2), "s")
+
+    aimd = AdaptiveConcurrency(initial=4, max_limit=8)
+    for _ in range(8):
+        aimd.release(aimd.acquire())
+    print("limit after 8 successes=", round(aimd.limit, 2))
+    tickets = [aimd.acquire() for _ in range(4)]
+    for t in tickets:
+        aimd.release(t, throttled=True)
+    print("limit after 4 throttles in one window=", round(aimd.limit, 2))